@@ -1,98 +1,376 @@
+import bisect
 import json
+import mmap
+import operator
 import os
+import sys
+import time
+
+# orjson is optional: it is a much faster encoder/decoder, but the standard library works too
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# TASK_FILE is machine-facing, so it is written without any indentation or padding
+if orjson is not None:
+    def _dumps(obj):
+        return orjson.dumps(obj)
+
+    # orjson parses straight from a buffer such as a memoryview over the mmap
+    _loads = orjson.loads
+else:
+    def _dumps(obj):
+        return json.dumps(obj, separators=(',', ':')).encode()
+
+    def _loads(buf):
+        return json.loads(bytes(buf))
 
 # --- Configuration ---
 TASK_FILE = 'tasks.json'
+TASK_LOG = 'tasks.log'
+# Human-readable copy of the tasks, only written when the user asks for it
+EXPORT_FILE = 'tasks_export.json'
+# Number of logged operations after which the log is folded back into TASK_FILE
+COMPACT_EVERY = 100
+# Minimum number of seconds between two writes of pending edits to the log
+FLUSH_INTERVAL = 2.0
 # Priorities are represented by integers: 1 (High), 2 (Medium), 3 (Low)
+PRIORITIES = (1, 2, 3)
+VALID_PRIORITIES = frozenset(PRIORITIES)
+# Display order of the (completed, priority) buckets: incomplete tasks first, then by priority
+BUCKET_ORDER = tuple((completed, priority) for completed in (False, True) for priority in PRIORITIES)
+
+# --- Display ---
+# Define color codes for better visibility (ANSI escape codes)
+PRIORITY_COLORS = {
+    1: "\033[91m",  # Red for High
+    2: "\033[93m",  # Yellow for Medium
+    3: "\033[94m",  # Blue for Low
+}
+RESET_COLOR = "\033[0m"
+# The escape code \033[9m adds a strike-through effect
+LINE_STRIKE = "\033[9m"
+# (start, end) codes wrapped around a task line, indexed by its 'completed' flag
+LINE_STYLES = (("", ""), (LINE_STRIKE, RESET_COLOR + RESET_COLOR))
+STATUS_CHECKED = "[X]"
+STATUS_UNCHECKED = "[ ]"
+SEPARATOR = "============================================="
+# Leading "" gives the blank line before the list, trailing "" the one after it
+HEADER = ("", SEPARATOR, "           Task Manager To-Do List           ", SEPARATOR)
+FOOTER = (SEPARATOR, "")
+
+# C-level accessor for a task's ID, used where IDs are pulled from many tasks at once
+_get_id = operator.itemgetter('id')
 
 def load_tasks():
     """
-    Loads tasks from the JSON file. If the file doesn't exist, returns an empty list.
+    Loads the task state from the JSON file. If the file doesn't exist, returns an empty state.
+
+    The state is a dict holding the list of tasks, an index of those tasks by ID,
+    their IDs bucketed by (completed, priority) in display order and the next ID to hand out.
+    Older files that contain a plain list of tasks are upgraded on load.
+    Any operations recorded in the task log since the last snapshot are replayed on top.
     """
+    data = []
     if os.path.exists(TASK_FILE):
         try:
-            with open(TASK_FILE, 'r') as f:
-                # Load the list of task dictionaries
-                return json.load(f)
-        except (json.JSONDecodeError, FileNotFoundError):
-            # Handle cases where the file is empty or corrupted
-            return []
-    return []
+            # Map the file and parse its bytes directly, skipping the buffered text read
+            fd = os.open(TASK_FILE, os.O_RDONLY)
+            try:
+                with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                    data = _loads(view)
+            finally:
+                os.close(fd)
+        except (ValueError, FileNotFoundError):
+            # Handle cases where the file is empty (mmap rejects zero length) or corrupted.
+            # Both JSON decoders raise a ValueError subclass, so corrupted files land here too.
+            data = []
+
+    if isinstance(data, list):
+        # Old format: a bare list of task dictionaries
+        data = {'tasks': data}
+
+    tasks = data.get('tasks', [])
+    next_id = data.get('next_id')
+    if next_id is None:
+        # Compute the counter once from the existing IDs
+        next_id = max(map(_get_id, tasks), default=0) + 1
+    state = {
+        'next_id': next_id,
+        'tasks': tasks,
+        # Same task dicts as in 'tasks', keyed by ID for constant-time lookups
+        'by_id': {task['id']: task for task in tasks},
+        # Task IDs per (completed, priority), each list kept in ID order
+        'buckets': {key: [] for key in BUCKET_ORDER},
+        # Bumped whenever the buckets change; 'view' caches the rendered list as (version, text)
+        'version': 0,
+        'view': None,
+        'log': None,
+        'ops': 0,
+        'pending': [],
+        'dirty': False,
+        'last_save': time.monotonic(),
+    }
+    for task in tasks:
+        state['buckets'][(task['completed'], task['priority'])].append(task['id'])
+    for bucket in state['buckets'].values():
+        # Snapshots are normally already in ID order, making this a linear pass
+        bucket.sort()
+
+    if os.path.exists(TASK_LOG):
+        # Byte offset just past the last complete, valid line
+        good_end = 0
+        torn = False
+        with open(TASK_LOG, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b"\n"):
+                        raise ValueError("unterminated log line")
+                    op = _loads(line)
+                except ValueError:
+                    # A torn last line from an interrupted write; nothing after it is valid
+                    torn = True
+                    break
+                replay_op(state, op)
+                state['ops'] += 1
+                good_end += len(line)
+        if torn:
+            # Cut the torn bytes off, or the next appended batch would be glued onto them
+            os.truncate(TASK_LOG, good_end)
+    return state
+
+def replay_op(state, op):
+    """
+    Applies one logged operation to the task state.
+
+    Replaying is safe on a snapshot that already contains the operation,
+    since IDs are never reused and the other operations just set a value.
+    """
+    kind = op['op']
+
+    if kind == 'add':
+        task = op['task']
+        if task['id'] >= state['next_id']:
+            state['tasks'].append(task)
+            state['by_id'][task['id']] = task
+            bucket_insert(state, task)
+            state['next_id'] = task['id'] + 1
+        return
+
+    if kind == 'delete':
+        target_task = state['by_id'].pop(op['id'], None)
+        if target_task is not None:
+            state['tasks'].remove(target_task)
+            bucket_remove(state, target_task)
+        return
+
+    target_task = state['by_id'].get(op['id'])
+    if target_task is None:
+        return
+    if kind == 'complete':
+        update_task(state, target_task, completed=True)
+    elif kind == 'priority':
+        update_task(state, target_task, priority=op['priority'])
 
-def save_tasks(tasks):
+def bucket_insert(state, task):
     """
-    Saves the current list of tasks to the JSON file.
+    Files a task's ID into the bucket for its current status and priority, keeping ID order.
     """
-    with open(TASK_FILE, 'w') as f:
-        # Write the list of task dictionaries to the file
-        json.dump(tasks, f, indent=4)
+    bisect.insort(state['buckets'][(task['completed'], task['priority'])], task['id'])
+    state['version'] += 1
 
-def generate_new_id(tasks):
+def bucket_remove(state, task):
     """
-    Generates a unique ID for a new task by finding the maximum existing ID + 1.
+    Takes a task's ID out of the bucket for its current status and priority.
     """
-    if not tasks:
-        return 1
-    # Get the max ID from all tasks and add 1
-    return max(task['id'] for task in tasks) + 1
+    bucket = state['buckets'][(task['completed'], task['priority'])]
+    # The bucket is in ID order, so binary search finds the position directly
+    del bucket[bisect.bisect_left(bucket, task['id'])]
+    state['version'] += 1
+
+def update_task(state, task, completed=None, priority=None):
+    """
+    Changes a task's status and/or priority, moving it to the matching bucket.
+    """
+    bucket_remove(state, task)
+    if completed is not None:
+        task['completed'] = completed
+    if priority is not None:
+        task['priority'] = priority
+    bucket_insert(state, task)
+
+def _prompt(message):
+    """
+    Shows a prompt and reads one line of input, like input() but straight from stdin.
+    Surrounding whitespace is stripped; raises EOFError once input runs out, as input() does.
+    """
+    sys.stdout.write(message)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line.strip()
+
+def save_tasks(state, durable=False):
+    """
+    Saves the current task state (tasks and next ID) to the JSON file.
+
+    The state is written to a temporary file that then replaces TASK_FILE in one
+    atomic rename, so an interrupted save never leaves a truncated file behind.
+    Only a durable save waits for the data to reach the disk.
+    """
+    tmp = TASK_FILE + '.tmp'
+    with open(tmp, 'wb') as f:
+        # Write the encoded task state to the file
+        f.write(_dumps({'next_id': state['next_id'], 'tasks': state['tasks']}))
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+    os.replace(tmp, TASK_FILE)
+
+    if durable:
+        # Sync the directory too, so the rename itself is on disk
+        try:
+            dir_fd = os.open(os.path.dirname(os.path.abspath(TASK_FILE)), os.O_RDONLY)
+        except OSError:
+            # Directories cannot be opened this way on Windows
+            return
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def dump_pretty(state, path):
+    """
+    Writes the task state as indented JSON, for reading rather than loading.
+    """
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'next_id': state['next_id'], 'tasks': state['tasks']}, f, indent=4, ensure_ascii=False)
+
+def append_op(state, op):
+    """
+    Queues a single task operation for the log instead of rewriting the whole file.
+    Queued operations are written together by flush_log, straight away if the
+    last save was more than FLUSH_INTERVAL seconds ago.
+    """
+    state['pending'].append(_dumps(op) + b"\n")
+    mark_dirty(state)
+    if time.monotonic() - state['last_save'] > FLUSH_INTERVAL:
+        flush_log(state)
+
+def mark_dirty(state):
+    """
+    Flags the state as having edits that have not been saved yet.
+    """
+    state['dirty'] = True
+
+def flush_log(state):
+    """
+    Writes all queued operations to the log in one go and syncs it to disk.
+    The log is compacted into a fresh snapshot every COMPACT_EVERY operations.
+    """
+    log = state['log']
+    if log is None:
+        # No log open (e.g. used outside the CLI loop): fall back to a full save
+        save_tasks(state)
+    else:
+        log.write(b''.join(state['pending']))
+        log.flush()
+        os.fsync(log.fileno())
+        state['ops'] += len(state['pending'])
+
+    state['pending'].clear()
+    state['dirty'] = False
+    state['last_save'] = time.monotonic()
+    if state['ops'] >= COMPACT_EVERY:
+        compact(state)
+
+def compact(state, durable=False):
+    """
+    Writes a fresh snapshot of the task state and empties the log.
+    The snapshot already contains any queued operations, so they are dropped.
+
+    Once the log is truncated the snapshot is the only copy of the logged edits,
+    so whenever a log is open the snapshot is synced to disk before truncating it.
+    """
+    log = state['log']
+    save_tasks(state, durable or log is not None)
+    if log is not None:
+        log.seek(0)
+        log.truncate()
+    state['ops'] = 0
+    state['pending'].clear()
+    state['dirty'] = False
+    state['last_save'] = time.monotonic()
+
+def final_save(state):
+    """
+    Compacts the log on exit and makes sure the new snapshot is safely on disk,
+    even when no log is open.
+    """
+    compact(state, durable=True)
 
-def display_tasks(tasks):
+def generate_new_id(state):
+    """
+    Hands out a unique ID for a new task from the running counter in the state.
+    """
+    new_id = state['next_id']
+    state['next_id'] += 1
+    return new_id
+
+def display_tasks(state):
     """
     Displays all tasks, sorted by priority (1=High to 3=Low).
     """
-    if not tasks:
+    if not state['tasks']:
         print("\n--- Your To-Do List is empty! ---")
         return
 
-    # Sort tasks: Completed tasks go to the bottom, then sort by priority (ascending)
-    # The 'completed' status is treated as a secondary key: False (0) comes before True (1)
-    # This keeps incomplete tasks at the top, sorted by priority.
-    sorted_tasks = sorted(tasks, key=lambda x: (x['completed'], x['priority'], x['id']))
+    # Viewing the list again without edits in between reuses the last rendering
+    view = state['view']
+    if view is None or view[0] != state['version']:
+        # Completed tasks go to the bottom, and within each group tasks are ordered by
+        # priority, then ID. The buckets already hold the IDs in exactly that order,
+        # so the list is produced by walking them; no sorting is needed.
+        by_id = state['by_id']
+        buckets = state['buckets']
+        sorted_tasks = [by_id[task_id] for key in BUCKET_ORDER for task_id in buckets[key]]
 
-    print("\n=============================================")
-    print("           Task Manager To-Do List           ")
-    print("=============================================")
+        # Collect every output line and write them all at once
+        lines = list(HEADER)
 
-    # Define color codes for better visibility (ANSI escape codes)
-    PRIORITY_COLORS = {
-        1: "\033[91m",  # Red for High
-        2: "\033[93m",  # Yellow for Medium
-        3: "\033[94m",  # Blue for Low
-    }
-    RESET_COLOR = "\033[0m"
+        for task in sorted_tasks:
+            status = STATUS_CHECKED if task['completed'] else STATUS_UNCHECKED
+            # Priorities are validated on input, so every task has a color
+            prio_color = PRIORITY_COLORS[task['priority']]
 
-    for task in sorted_tasks:
-        status = "[X]" if task['completed'] else "[ ]"
-        prio_color = PRIORITY_COLORS.get(task['priority'], RESET_COLOR)
+            # Apply strike-through for completed tasks
+            line_style_start, line_style_end = LINE_STYLES[task['completed']]
 
-        # Apply strike-through for completed tasks
-        if task['completed']:
-            # The escape code \033[9m adds a strike-through effect
-            line_style_start = "\033[9m"
-            line_style_end = RESET_COLOR + RESET_COLOR
-        else:
-            line_style_start = ""
-            line_style_end = ""
+            # Format the output string from its fragments in one join
+            lines.append("".join((
+                line_style_start, prio_color,
+                "ID ", str(task['id']).ljust(3), " | ", status, " ",
+                task['description'],
+                " (Prio: ", str(task['priority']), ")",
+                line_style_end,
+            )))
 
-        # Format the output string
-        task_line = (
-            f"{line_style_start}{prio_color}"
-            f"ID {task['id']:<3} | {status} "
-            f"{task['description']}"
-            f" (Prio: {task['priority']})"
-            f"{line_style_end}"
-        )
-        print(task_line)
+        lines.extend(FOOTER)
+        view = (state['version'], "\n".join(lines) + "\n")
+        state['view'] = view
 
-    print("=============================================\n")
+    sys.stdout.write(view[1])
 
 
-def add_task(tasks):
+def add_task(state):
     """
     Prompts the user for a task description and priority, then adds the new task.
     """
+    tasks = state['tasks']
     print("\n--- ADD NEW TASK ---")
-    description = input("Enter task description: ").strip()
+    description = _prompt("Enter task description: ")
 
     if not description:
         print("\nError: Task description cannot be empty.")
@@ -100,15 +378,15 @@ def add_task(tasks):
 
     while True:
         try:
-            priority = int(input("Enter priority (1=High, 2=Medium, 3=Low): ").strip())
-            if priority in [1, 2, 3]:
+            priority = int(_prompt("Enter priority (1=High, 2=Medium, 3=Low): "))
+            if priority in VALID_PRIORITIES:
                 break
             else:
                 print("Error: Priority must be 1, 2, or 3.")
         except ValueError:
             print("Error: Invalid input. Please enter a number (1, 2, or 3).")
 
-    new_id = generate_new_id(tasks)
+    new_id = generate_new_id(state)
     new_task = {
         'id': new_id,
         'description': description,
@@ -117,83 +395,84 @@ def add_task(tasks):
     }
 
     tasks.append(new_task)
-    save_tasks(tasks)
+    state['by_id'][new_id] = new_task
+    bucket_insert(state, new_task)
+    append_op(state, {'op': 'add', 'task': new_task})
     print(f"\n✅ Task ID {new_id} added successfully: '{description}' (Priority: {priority}).")
 
 
-def delete_task(tasks):
+def delete_task(state):
     """
     Prompts for a Task ID and removes the corresponding task.
     """
-    display_tasks(tasks)
+    tasks = state['tasks']
+    display_tasks(state)
     if not tasks:
         return
 
     while True:
         try:
-            task_id = int(input("Enter ID of the task to DELETE: ").strip())
+            task_id = int(_prompt("Enter ID of the task to DELETE: "))
             break
         except ValueError:
             print("Error: Invalid input. Please enter a numerical ID.")
 
-    # Find the task index by its ID
-    initial_length = len(tasks)
-    # Filter the list, keeping only tasks whose ID does NOT match the input ID
-    tasks[:] = [task for task in tasks if task['id'] != task_id]
+    # Look the task up by its ID and drop it from both the index and the list
+    target_task = state['by_id'].pop(task_id, None)
 
-    if len(tasks) < initial_length:
-        save_tasks(tasks)
+    if target_task is not None:
+        tasks.remove(target_task)
+        bucket_remove(state, target_task)
+        append_op(state, {'op': 'delete', 'id': task_id})
         print(f"\n🗑️ Task ID {task_id} successfully DELETED.")
     else:
         print(f"\n❌ Error: Task with ID {task_id} not found.")
 
 
-def complete_task(tasks):
+def complete_task(state):
     """
     Prompts for a Task ID and marks the corresponding task as complete.
     """
-    display_tasks(tasks)
+    tasks = state['tasks']
+    display_tasks(state)
     if not tasks:
         return
 
     while True:
         try:
-            task_id = int(input("Enter ID of the task to MARK AS COMPLETE: ").strip())
+            task_id = int(_prompt("Enter ID of the task to MARK AS COMPLETE: "))
             break
         except ValueError:
             print("Error: Invalid input. Please enter a numerical ID.")
 
-    found = False
-    for task in tasks:
-        if task['id'] == task_id:
-            task['completed'] = True
-            found = True
-            break
+    target_task = state['by_id'].get(task_id)
 
-    if found:
-        save_tasks(tasks)
+    if target_task is not None:
+        update_task(state, target_task, completed=True)
+        append_op(state, {'op': 'complete', 'id': task_id})
         print(f"\n🎉 Task ID {task_id} marked as COMPLETE.")
     else:
         print(f"\n❌ Error: Task with ID {task_id} not found.")
 
 
-def prioritize_task(tasks):
+def prioritize_task(state):
     """
     Prompts for a Task ID and allows the user to change its priority.
     """
-    display_tasks(tasks)
+    tasks = state['tasks']
+    display_tasks(state)
     if not tasks:
         return
 
     while True:
         try:
-            task_id = int(input("Enter ID of the task to CHANGE PRIORITY: ").strip())
+            task_id = int(_prompt("Enter ID of the task to CHANGE PRIORITY: "))
             break
         except ValueError:
             print("Error: Invalid input. Please enter a numerical ID.")
 
     # Find the task
-    target_task = next((task for task in tasks if task['id'] == task_id), None)
+    target_task = state['by_id'].get(task_id)
 
     if not target_task:
         print(f"\n❌ Error: Task with ID {task_id} not found.")
@@ -201,17 +480,17 @@ def prioritize_task(tasks):
 
     while True:
         try:
-            new_priority = int(input(f"Enter new priority for ID {task_id} (Current: {target_task['priority']}) (1=High, 2=Medium, 3=Low): ").strip())
-            if new_priority in [1, 2, 3]:
+            new_priority = int(_prompt(f"Enter new priority for ID {task_id} (Current: {target_task['priority']}) (1=High, 2=Medium, 3=Low): "))
+            if new_priority in VALID_PRIORITIES:
                 break
             else:
                 print("Error: Priority must be 1, 2, or 3.")
         except ValueError:
             print("Error: Invalid input. Please enter a number (1, 2, or 3).")
 
-    # Update the priority and save
-    target_task['priority'] = new_priority
-    save_tasks(tasks)
+    # Update the priority and log the change
+    update_task(state, target_task, priority=new_priority)
+    append_op(state, {'op': 'priority', 'id': task_id, 'priority': new_priority})
     print(f"\n👍 Task ID {task_id} priority updated to {new_priority}.")
 
 
@@ -225,6 +504,8 @@ def show_menu():
     print("3: Mark Task as Complete")
     print("4: Change Task Priority")
     print("5: Delete Task")
+    print("6: Force Save")
+    print("7: Export Tasks (Readable JSON)")
     print("0: Exit & Save")
     print("-------------------------")
 
@@ -233,31 +514,54 @@ def main_cli():
     """
     The main loop for the Command-Line Interface.
     """
-    tasks = load_tasks()
-    print("\n✨ Welcome to the Python CLI Task Manager! ✨")
-
-    while True:
-        display_tasks(tasks)
-        show_menu()
-        choice = input("Enter your choice (0-5): ").strip()
-
-        if choice == '1':
-            # View Tasks - Already done at the start of the loop, but here for completeness
-            continue
-        elif choice == '2':
-            add_task(tasks)
-        elif choice == '3':
-            complete_task(tasks)
-        elif choice == '4':
-            prioritize_task(tasks)
-        elif choice == '5':
-            delete_task(tasks)
-        elif choice == '0':
-            print("\n👋 Saving tasks and exiting. Goodbye!")
-            save_tasks(tasks)
-            break
-        else:
-            print("\n🚨 Invalid choice. Please enter a number between 0 and 5.")
+    state = load_tasks()
+    # Keep the log open for the whole session: edits are flushed to it in batches and
+    # compaction truncates it in place, so it is never reopened. TASK_FILE itself is
+    # still replaced on each save, since rewriting it in place could tear it.
+    state['log'] = open(TASK_LOG, 'ab')
+    try:
+        print("\n✨ Welcome to the Python CLI Task Manager! ✨")
+        display_tasks(state)
+
+        while True:
+            # The list is only drawn on request; the edit actions draw it themselves before prompting
+            show_menu()
+            choice = _prompt("Enter your choice (0-7): ")
+
+            if choice == '1':
+                display_tasks(state)
+            elif choice == '2':
+                add_task(state)
+            elif choice == '3':
+                complete_task(state)
+            elif choice == '4':
+                prioritize_task(state)
+            elif choice == '5':
+                delete_task(state)
+            elif choice == '6':
+                flush_log(state)
+                print("\n💾 Tasks saved.")
+            elif choice == '7':
+                dump_pretty(state, EXPORT_FILE)
+                print(f"\n📄 Tasks exported to '{EXPORT_FILE}'.")
+            elif choice == '0':
+                print("\n👋 Saving tasks and exiting. Goodbye!")
+                final_save(state)
+                break
+            else:
+                print("\n🚨 Invalid choice. Please enter a number between 0 and 7.")
+
+            # Edits queued within FLUSH_INTERVAL of the last save go out with the next action after it
+            if state['dirty'] and time.monotonic() - state['last_save'] > FLUSH_INTERVAL:
+                flush_log(state)
+    except (EOFError, KeyboardInterrupt):
+        # Input ended without choosing 0 (closed pipe, Ctrl+D or Ctrl+C)
+        print("\n👋 Input closed. Saving pending edits and exiting.")
+    finally:
+        # Whatever ends the session, queued edits must not be dropped
+        if state['dirty']:
+            flush_log(state)
+        state['log'].close()
 
 if __name__ == "__main__":
     main_cli()